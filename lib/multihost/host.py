@@ -315,9 +315,12 @@ class IPAHost(ProviderHost):
         if self.__backup is not None:
             return
 
-        self.ssh.run('ipa-backup --data --online')
-        cmd = self.ssh.run('ls /var/lib/ipa/backup | tail -n 1')
-        self.__backup = cmd.stdout.strip()
+        cmd = self.ssh.run('''
+            set -e
+            ipa-backup --data --online
+            ls /var/lib/ipa/backup | tail -n 1
+        ''')
+        self.__backup = cmd.stdout_lines[-1].strip()
 
     def restore(self) -> None:
         """
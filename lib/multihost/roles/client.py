@@ -39,8 +39,15 @@ class Client(LinuxRole):
         #. import implicit domains from topology marker
         """
         super().setup()
-        self.sssd.stop()
-        self.sssd.clear(db=True, logs=True, config=True)
 
-        for domain, path in self.mh.data.topology_mark.domains.items():
-            self.sssd.import_domain(domain, self.mh._lookup(path))
+        # Stop sssd in the background and import the domains while the remote
+        # command is running, the imports only touch the local configuration.
+        process = self.sssd.async_stop()
+
+        self.sssd.import_domains({
+            domain: self.mh._lookup(path)
+            for domain, path in self.mh.data.topology_mark.domains.items()
+        })
+
+        process.wait()
+        self.sssd.clear(db=True, logs=True, config=True)
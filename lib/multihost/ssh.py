@@ -604,6 +604,19 @@ class SSHClient(object):
 
         self.__conn: pssh.clients.ssh.SSHClient | None = None
 
+    # Pool of open pssh connections shared between SSHClient instances,
+    # similar to OpenSSH's ControlMaster. Key is (host, port, user,
+    # password), value is the connection and number of SSHClient instances
+    # that use it. The password is part of the key on purpose: a client
+    # with different credentials must perform its own authentication
+    # instead of silently reusing a session that was opened with valid
+    # ones.
+    __pool: dict[tuple[str, int, str, str], list] = {}
+
+    @property
+    def __pool_key(self) -> tuple[str, int, str, str]:
+        return (self.host, self.port, self.user, self.password)
+
     @property
     def connected(self) -> bool:
         """
@@ -628,10 +641,23 @@ class SSHClient(object):
     def connect(self) -> None:
         """
         Connect to the host.
+
+        An already established connection to the same host, port, user and
+        password is reused if it exists, opening a new connection only for the
+        first client. This avoids the cost of repeated SSH handshakes when
+        multiple clients talk to the same host, while clients with different
+        credentials still authenticate on their own.
         """
         if self.connected:
             return
 
+        entry = self.__pool.get(self.__pool_key)
+        if entry is not None:
+            (conn, refcount) = entry
+            entry[1] = refcount + 1
+            self.__conn = conn
+            return
+
         self.logger.info(
             self.logger.colorize('Opening SSH connection to ', c.Style.BRIGHT)
             + self.logger.colorize(self.host, c.Fore.BLUE, c.Style.BRIGHT)
@@ -644,20 +670,35 @@ class SSHClient(object):
             port=self.port,
         )
 
+        self.__pool[self.__pool_key] = [self.__conn, 1]
+
     def disconnect(self) -> None:
         """
         Disconnect client.
+
+        The underlying connection is closed only when this is the last client
+        that uses it, otherwise it is kept open for the remaining clients.
         """
+        if not self.connected:
+            return
+
+        self.__conn = None
+
+        entry = self.__pool.get(self.__pool_key)
+        if entry is None:
+            return
+
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+
         self.logger.info(
             self.logger.colorize('Closing SSH connection to ', c.Style.BRIGHT)
             + self.logger.colorize(self.host, c.Fore.BLUE, c.Style.BRIGHT)
         )
 
-        if not self.connected:
-            return
-
-        self.__conn.disconnect()
-        self.__conn = None
+        entry[0].disconnect()
+        del self.__pool[self.__pool_key]
 
     def async_run(
         self,
@@ -1,12 +1,27 @@
 from __future__ import annotations
 
 import base64
+import gzip
+import re
+import shlex
 import textwrap
+import zlib
 
 from ..host import MultihostHost
-from ..ssh import SSHLog
+from ..ssh import SSHLog, SSHProcessError, SSHProcessResult
 from .base import MultihostUtility
 
+MKDIR_CREATED_RE = re.compile(r"mkdir:[^']+'(.+)'$")
+"""
+Matches ``mkdir -v`` output, the group holds the created directory path.
+"""
+
+BACKUP_MARKER = 'mh.fs.backup:'
+"""
+Prefix of the stdout line that carries the backup path created by an
+in-script backup, see :meth:`HostFileSystem.backup`.
+"""
+
 
 class HostFileSystem(MultihostUtility):
     """
@@ -22,6 +37,7 @@ class HostFileSystem(MultihostUtility):
         """
         super().__init__(host)
         self.__rollback: list[str] = []
+        self.__chattrs_cache: dict[tuple, str] = {}
 
     def teardown(self):
         """
@@ -48,18 +64,17 @@ class HostFileSystem(MultihostUtility):
         :param group: Group, defaults to None
         :type group: str, optional
         """
-        self.backup(path)
-        self.logger.info(f'Creating directory "{path}" on {self.host.hostname}')
-        self.host.ssh.run(
+        self.logger.info('Creating directory "%s" on %s', path, self.host.hostname)
+        quoted = shlex.quote(path)
+        self.__run_with_backup(
+            path,
             f'''
-                set -ex
-                rm -fr '{path}'
-                mkdir '{path}'
+                rm -fr {quoted}
+                mkdir {quoted}
                 {self.__gen_chattrs(path, mode=mode, user=user, group=group)}
-            ''',
-            log_level=SSHLog.Error
+            '''
         )
-        self.__rollback.append(f"rm -fr '{path}'")
+        self.__rollback.append(f'rm -fr {quoted}')
 
     def mkdir_p(self, path: str, *, mode: str = None, user: str = None, group: str = None) -> None:
         """
@@ -74,20 +89,24 @@ class HostFileSystem(MultihostUtility):
         :param group: Group, defaults to None
         :type group: str, optional
         """
-        self.backup(path)
-        self.logger.info(f'Creating directory "{path}" (with parents) on {self.host.hostname}')
-        result = self.host.ssh.run(
+        self.logger.info('Creating directory "%s" (with parents) on %s', path, self.host.hostname)
+        quoted = shlex.quote(path)
+        result = self.__run_with_backup(
+            path,
             f'''
-                set -ex
-                rm -fr '{path}'
-                mkdir -v -p '{path}' | head -1 | sed -E "s/mkdir:[^']+'(.+)'$/\\1/"
+                rm -fr {quoted}
+                mkdir -v -p {quoted}
                 {self.__gen_chattrs(path, mode=mode, user=user, group=group)}
-            ''',
-            log_level=SSHLog.Error
+            '''
         )
 
-        if result.stdout:
-            self.__rollback.append(f"rm -fr '{result.stdout}'")
+        # The first verbose line belongs to the topmost directory that was
+        # created, removing it rolls back all children as well.
+        for line in result.stdout_lines:
+            match = MKDIR_CREATED_RE.search(line)
+            if match:
+                self.__rollback.append(f'rm -fr {shlex.quote(match.group(1))}')
+                break
 
     def mktmp(self, *, mode: str = None, user: str = None, group: str = None) -> str:
         """
@@ -104,25 +123,30 @@ class HostFileSystem(MultihostUtility):
         :rtype: str
         """
 
-        self.logger.info(f'Creating temporary file on {self.host.hostname}')
-        result = self.host.ssh.run(
-            '''
-                set -ex
-                tmp=`mktemp /tmp/mh.fs.rollback.XXXXXXXXX`
-                echo $tmp
-            ''',
-            log_level=SSHLog.Error
-        )
+        self.logger.info('Creating temporary file on %s', self.host.hostname)
+        try:
+            result = self.host.ssh.run(
+                f'''
+                    set -ex
+                    tmp=`mktemp /tmp/mh.fs.rollback.XXXXXXXXX`
+                    echo $tmp
+                    {self.__gen_chattrs('"$tmp"', mode=mode, user=user, group=group, quote_path=False)}
+                ''',
+                log_level=SSHLog.Error
+            )
+        except SSHProcessError as e:
+            # The file exists even if setting the attributes failed, make sure
+            # it is removed on teardown
+            tmpfile = e.stdout.strip()
+            if tmpfile:
+                self.__rollback.append(f'rm --force {shlex.quote(tmpfile)}')
+            raise
 
         tmpfile = result.stdout.strip()
         if not tmpfile:
             raise OSError("Temporary file was not created")
 
-        self.__rollback.append(f"rm --force '{tmpfile}'")
-
-        attrs = self.__gen_chattrs(tmpfile, mode=mode, user=user, group=group)
-        if attrs:
-            self.host.ssh.run(attrs, log_level=SSHLog.Error)
+        self.__rollback.append(f'rm --force {shlex.quote(tmpfile)}')
 
         return tmpfile
 
@@ -135,7 +159,7 @@ class HostFileSystem(MultihostUtility):
         :return: File contents.
         :rtype: str
         """
-        self.logger.info(f'Reading file "{path}" on {self.host.hostname}')
+        self.logger.info('Reading file "%s" on %s', path, self.host.hostname)
         result = self.host.ssh.exec(['cat', path], log_level=SSHLog.Error)
 
         return result.stdout
@@ -169,22 +193,22 @@ class HostFileSystem(MultihostUtility):
         if dedent:
             contents = textwrap.dedent(contents).strip()
 
-        self.backup(path)
         self.logger.info(
-            f'Writing file "{path}" on {self.host.hostname}',
+            'Writing file "%s" on %s', path, self.host.hostname,
             extra={'data': {'Contents': contents}}
         )
 
-        self.host.ssh.run(
+        quoted = shlex.quote(path)
+        self.__run_with_backup(
+            path,
             f'''
-                set -ex
-                rm -fr '{path}'
-                cat > '{path}'
+                rm -fr {quoted}
+                cat > {quoted}
                 {self.__gen_chattrs(path, mode=mode, user=user, group=group)}
             ''',
-            input=contents, log_level=SSHLog.Error
+            input=contents
         )
-        self.__rollback.append(f"rm --force '{path}'")
+        self.__rollback.append(f'rm --force {quoted}')
 
     def upload(
         self,
@@ -209,21 +233,45 @@ class HostFileSystem(MultihostUtility):
         :param group: Group, defaults to None
         :type group: str, optional
         """
-        self.backup(remote_path)
-        self.logger.info(f'Uploading file "{local_path}" to "{self.host.hostname}:{remote_path}"')
-        with open(local_path, 'rb') as f:
-            encoded = base64.b64encode(f.read()).decode('utf-8')
+        self.logger.info('Uploading file "%s" to "%s:%s"', local_path, self.host.hostname, remote_path)
 
-        self.host.ssh.run(
+        quoted = shlex.quote(remote_path)
+        process = self.host.ssh.async_run(
             f'''
                 set -ex
-                rm -fr '{remote_path}'
-                base64 --decode > '{remote_path}'
+                {self.__gen_backup(remote_path)}
+                rm -fr {quoted}
+                base64 --decode | gzip --decompress > {quoted}
                 {self.__gen_chattrs(remote_path, mode=mode, user=user, group=group)}
             ''',
-            input=encoded, log_level=SSHLog.Error
+            log_level=SSHLog.Error
         )
-        self.__rollback.append(f"rm --force '{remote_path}'")
+
+        # Compress and encode the file chunk by chunk so the whole
+        # contents is never held in memory at once. Base64 input must be
+        # encoded in multiples of three bytes to concatenate correctly.
+        compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+        pending = b''
+        with open(local_path, 'rb') as f:
+            while chunk := f.read(1024 * 1024):
+                pending += compressor.compress(chunk)
+                cut = len(pending) - len(pending) % 3
+                if cut:
+                    process.stdin.write(base64.b64encode(pending[:cut]).decode('utf-8'))
+                    pending = pending[cut:]
+
+        pending += compressor.flush()
+        if pending:
+            process.stdin.write(base64.b64encode(pending).decode('utf-8'))
+
+        try:
+            result = process.wait()
+        except SSHProcessError as e:
+            self.__register_backup(remote_path, e.stdout)
+            raise
+
+        self.__register_backup(remote_path, result.stdout)
+        self.__rollback.append(f'rm --force {quoted}')
 
     def download(self, remote_path: str, local_path: str) -> None:
         """
@@ -234,10 +282,16 @@ class HostFileSystem(MultihostUtility):
         :param local_path: Local path.
         :type local_path: str
         """
-        self.logger.info(f'Downloading file "{remote_path}" from {self.host.hostname} to "{local_path}"')
-        result = self.host.ssh.exec(['base64', remote_path], log_level=SSHLog.Error)
+        self.logger.info('Downloading file "%s" from %s to "%s"', remote_path, self.host.hostname, local_path)
+        result = self.host.ssh.run(
+            f'''
+                set -o pipefail
+                gzip --stdout {shlex.quote(remote_path)} | base64
+            ''',
+            log_level=SSHLog.Error
+        )
         with open(local_path, 'wb') as f:
-            f.write(base64.b64decode(result.stdout))
+            f.write(gzip.decompress(base64.b64decode(result.stdout)))
 
     def download_files(self, paths: list[str], local_path: str) -> None:
         """
@@ -251,12 +305,12 @@ class HostFileSystem(MultihostUtility):
         :type local_path: str
         """
         self.logger.info(
-            f'Downloading files from {self.host.hostname} to "{local_path}"',
+            'Downloading files from %s to "%s"', self.host.hostname, local_path,
             extra={'data': {'Paths': paths}}
         )
         result = self.host.ssh.run(f'''
             tmp=`mktemp /tmp/mh.fs.download_files.XXXXXXXXX`
-            tar -czvf "$tmp" {' '.join([f'$(compgen -G "{path}")' for path in paths])} &> /dev/null
+            tar -czvf "$tmp" {' '.join([f'$(compgen -G {shlex.quote(path)})' for path in paths])} &> /dev/null
             base64 "$tmp"
             rm -f "$tmp" &> /dev/null
         ''', log_level=SSHLog.Error)
@@ -275,37 +329,110 @@ class HostFileSystem(MultihostUtility):
         :return: True if the path exists and backup was done, False otherwise.
         :rtype: bool
         """
-        self.logger.info(f'Creating a backup of "{path}" on {self.host.hostname}')
-        result = self.host.ssh.run(f'''
-        set -ex
+        script = self.__gen_backup(path)
+        if not script:
+            return False
+
+        self.logger.info('Creating a backup of "%s" on %s', path, self.host.hostname)
+        result = self.host.ssh.run(
+            f'''
+                set -ex
+                {script}
+            ''',
+            log_level=SSHLog.Error
+        )
+
+        return self.__register_backup(path, result.stdout)
+
+    def __run_with_backup(self, path: str, command: str, *, input: str | None = None) -> SSHProcessResult:
+        """
+        Run command prefixed with an in-script backup of the path, so the
+        backup and the operation cost a single SSH round-trip. The restore
+        rollback is registered even if the command fails after the backup
+        part succeeded.
+        """
+        try:
+            result = self.host.ssh.run(
+                f'''
+                    set -ex
+                    {self.__gen_backup(path)}
+                    {command}
+                ''',
+                input=input, log_level=SSHLog.Error
+            )
+        except SSHProcessError as e:
+            self.__register_backup(path, e.stdout)
+            raise
+
+        self.__register_backup(path, result.stdout)
+        return result
+
+    def __gen_backup(self, path: str) -> str:
+        """
+        Generate shell script snippet that backs up the path and prints the
+        backup location on a line prefixed with :data:`BACKUP_MARKER`.
+        Returns an empty string for paths that have nothing to preserve.
+        """
+        # Our own scratch files do not have any original contents to preserve
+        if path.startswith('/tmp/mh.fs.'):
+            return ''
 
-        if [ -f '{path}' ]; then
+        quoted = shlex.quote(path)
+        return f'''
+        if [ -f {quoted} ]; then
             tmp=`mktemp /tmp/mh.fs.rollback.XXXXXXXXX`
-            cp --force --archive '{path}' "$tmp"
-            echo "$tmp"
-        elif [ -d '{path}' ]; then
+            cp --force --archive {quoted} "$tmp"
+            echo "{BACKUP_MARKER}$tmp"
+        elif [ -d {quoted} ]; then
             tmp=`mktemp -d /tmp/mh.fs.rollback.XXXXXXXXX`
-            cp --force --archive '{path}/.' "$tmp"
-            echo "$tmp"
+            cp --force --archive {shlex.quote(path + '/.')} "$tmp"
+            echo "{BACKUP_MARKER}$tmp"
         fi
-        ''', log_level=SSHLog.Error)
+        '''
 
-        tmpfile = result.stdout.strip()
-        if tmpfile:
-            self.__rollback.append(f"mv --force '{tmpfile}' '{path}'")
-            return True
+    def __register_backup(self, path: str, stdout: str) -> bool:
+        """
+        Find the :data:`BACKUP_MARKER` line in the output of a script
+        generated by :meth:`__gen_backup` and register the restore rollback.
+        """
+        for line in stdout.splitlines():
+            if line.startswith(BACKUP_MARKER):
+                backup = shlex.quote(line[len(BACKUP_MARKER):].strip())
+                self.__rollback.append(f'mv --force {backup} {shlex.quote(path)}')
+                return True
 
         return False
 
-    def __gen_chattrs(self, path: str, *, mode: str = None, user: str = None, group: str = None) -> str:
+    def __gen_chattrs(
+        self,
+        path: str,
+        *,
+        mode: str = None,
+        user: str = None,
+        group: str = None,
+        quote_path: bool = True,
+    ) -> str:
+        if mode is None and user is None and group is None:
+            return ''
+
+        key = (path, mode, user, group, quote_path)
+        cached = self.__chattrs_cache.get(key)
+        if cached is not None:
+            return cached
+
+        quoted = shlex.quote(path) if quote_path else path
+
         cmds = []
         if mode is not None:
-            cmds.append(f"chmod '{mode}' '{path}'")
+            cmds.append(f'chmod {shlex.quote(mode)} {quoted}')
 
         if user is not None:
-            cmds.append(f"chown '{user}' '{path}'")
+            cmds.append(f'chown {shlex.quote(user)} {quoted}')
 
         if group is not None:
-            cmds.append(f"chgrp '{group}' '{path}'")
+            cmds.append(f'chgrp {shlex.quote(group)} {quoted}')
+
+        out = ' && '.join(cmds)
+        self.__chattrs_cache[key] = out
 
-        return ' && '.join(cmds)
+        return out
@@ -118,7 +118,7 @@ class LocalUser(object):
         }
 
         passwd = f" && passwd --stdin '{self.name}'" if password else ''
-        self.util.logger.info(f'Creating local user "{self.name}" on {self.util.host.hostname}')
+        self.util.logger.info('Creating local user "%s" on %s', self.name, self.util.host.hostname)
         self.util.host.ssh.run(self.util.cli.command('useradd', args) + passwd, input=password, log_level=SSHLog.Error)
 
         self.util._users.append(self.name)
@@ -163,7 +163,7 @@ class LocalUser(object):
         }
 
         passwd = f" && passwd --stdin '{self.name}'" if password else ''
-        self.util.logger.info(f'Modifying local user "{self.name}" on {self.util.host.hostname}')
+        self.util.logger.info('Modifying local user "%s" on %s', self.name, self.util.host.hostname)
         self.util.host.ssh.run(self.util.cli.command('usermod', args) + passwd, input=password, log_level=SSHLog.Error)
 
         return self
@@ -172,7 +172,7 @@ class LocalUser(object):
         """
         Delete the user.
         """
-        self.util.logger.info(f'Deleting local user "{self.name}" on {self.util.host.hostname}')
+        self.util.logger.info('Deleting local user "%s" on %s', self.name, self.util.host.hostname)
         self.util.host.ssh.run(f"userdel '{self.name}' --force --remove", log_level=SSHLog.Error)
         self.util._users.remove(self.name)
 
@@ -185,7 +185,7 @@ class LocalUser(object):
         :return: Dictionary with attribute name as a key.
         :rtype: dict[str, list[str]]
         """
-        self.util.logger.info(f'Fetching local user "{self.name}" on {self.util.host.hostname}')
+        self.util.logger.info('Fetching local user "%s" on %s', self.name, self.util.host.hostname)
         result = self.util.host.ssh.exec(['getent', 'passwd', self.name], raise_on_error=False, log_level=SSHLog.Error)
         if result.rc != 0:
             return {}
@@ -230,7 +230,7 @@ class LocalGroup(object):
             'gid': (self.util.cli.cli.VALUE, gid),
         }
 
-        self.util.logger.info(f'Creating local group "{self.name}" on {self.util.host.hostname}')
+        self.util.logger.info('Creating local group "%s" on %s', self.name, self.util.host.hostname)
         self.util.host.ssh.run(self.util.cli.command('groupadd', args), log_level=SSHLog.Silent)
         self.util._groups.append(self.name)
 
@@ -257,7 +257,7 @@ class LocalGroup(object):
             'gid': (self.util.cli.cli.VALUE, gid),
         }
 
-        self.util.logger.info(f'Modifying local group "{self.name}" on {self.util.host.hostname}')
+        self.util.logger.info('Modifying local group "%s" on %s', self.name, self.util.host.hostname)
         self.util.host.ssh.run(self.util.cli.command('groupmod', args), log_level=SSHLog.Error)
 
         return self
@@ -266,7 +266,7 @@ class LocalGroup(object):
         """
         Delete the group.
         """
-        self.util.logger.info(f'Deleting local group "{self.name}" on {self.util.host.hostname}')
+        self.util.logger.info('Deleting local group "%s" on %s', self.name, self.util.host.hostname)
         self.util.host.ssh.run(f"groupdel '{self.name}' --force", log_level=SSHLog.Error)
         self.util._groups.remove(self.name)
 
@@ -279,7 +279,7 @@ class LocalGroup(object):
         :return: Dictionary with attribute name as a key.
         :rtype: dict[str, list[str]]
         """
-        self.util.logger.info(f'Fetching local group "{self.name}" on {self.util.host.hostname}')
+        self.util.logger.info('Fetching local group "%s" on %s', self.name, self.util.host.hostname)
         result = self.util.host.ssh.exec(['getent', 'group', self.name], raise_on_error=False, log_level=SSHLog.Silent)
         if result.rc != 0:
             return {}
@@ -310,7 +310,7 @@ class LocalGroup(object):
         :return: Self.
         :rtype: LocalGroup
         """
-        self.util.logger.info(f'Adding members to group "{self.name}" on {self.util.host.hostname}')
+        self.util.logger.info('Adding members to group "%s" on %s', self.name, self.util.host.hostname)
 
         if not members:
             return self
@@ -340,7 +340,7 @@ class LocalGroup(object):
         :return: Self.
         :rtype: LocalGroup
         """
-        self.util.logger.info(f'Removing members from group "{self.name}" on {self.util.host.hostname}')
+        self.util.logger.info('Removing members from group "%s" on %s', self.name, self.util.host.hostname)
 
         if not members:
             return self
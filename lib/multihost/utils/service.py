@@ -15,12 +15,14 @@ class HostService(MultihostUtility):
         self.initial_states: dict[str, bool] = {}
 
     def teardown(self) -> None:
-        # Restart all services that were touched
-        self.reload_daemon()
+        # Restore all services that were touched, all in a single SSH command
+        cmds = ['systemctl daemon-reload']
         for service, state in self.initial_states.items():
-            self.host.ssh.run(f'systemctl stop "{service}" || systemctl status "{service}"', raise_on_error=False)
+            cmds.append(f'systemctl stop "{service}" || systemctl status "{service}"')
             if state:
-                self.host.ssh.run(f'systemctl start "{service}" || systemctl status "{service}"', raise_on_error=False)
+                cmds.append(f'systemctl start "{service}" || systemctl status "{service}"')
+
+        self.host.ssh.run('\n'.join(cmds), raise_on_error=False)
 
     def async_start(self, service: str) -> SSHProcess:
         """
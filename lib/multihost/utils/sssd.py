@@ -22,6 +22,17 @@ class HostSSSD(MultihostUtility):
     All changes are automatically reverted when a test is finished.
     """
 
+    DEFAULT_CONFIG: dict[str, dict[str, str]] = {
+        'sssd': {
+            'config_file_version': '2',
+            'services': 'nss, pam',
+        },
+    }
+    """
+    Default configuration, pre-parsed once so each test setup only needs to
+    load it with :meth:`configparser.ConfigParser.read_dict`.
+    """
+
     def __init__(self, host: MultihostHost, fs: HostFileSystem, svc: HostService, load_config: bool = False) -> None:
         super().__init__(host)
         self.fs = fs
@@ -56,11 +67,7 @@ class HostSSSD(MultihostUtility):
             return
 
         # Set default configuration
-        self.config.read_string('''
-            [sssd]
-            config_file_version = 2
-            services = nss, pam
-        ''')
+        self.config.read_dict(self.DEFAULT_CONFIG)
 
     def async_start(
         self,
@@ -211,18 +218,21 @@ class HostSSSD(MultihostUtility):
         :param logs: Remove logs, defaults to False
         :type logs: bool, optional
         """
-        cmd = 'rm -fr'
+        paths = []
 
         if db:
-            cmd += ' /var/lib/sss/db/*'
+            paths.append('/var/lib/sss/db/*')
 
         if config:
-            cmd += ' /etc/sssd/*.conf /etc/sssd/conf.d/*'
+            paths.append('/etc/sssd/*.conf /etc/sssd/conf.d/*')
 
         if logs:
-            cmd += ' /var/log/sssd/*'
+            paths.append('/var/log/sssd/*')
+
+        if not paths:
+            return
 
-        self.host.ssh.run('rm -fr /var/lib/sss/db/* /var/log/sssd/*')
+        self.host.ssh.run('rm -fr ' + ' '.join(paths))
 
     def enable_responder(self, responder: str) -> None:
         """
@@ -231,11 +241,10 @@ class HostSSSD(MultihostUtility):
         :param responder: Responder to enable.
         :type responder: str
         """
-        self.config.setdefault('sssd', {})
-        svc = self.config['sssd'].get('services', '')
+        sssd = self.section('sssd')
+        svc = sssd.get('services', '')
         if responder not in svc:
-            self.config['sssd']['services'] += ', ' + responder
-            self.config['sssd']['services'].lstrip(', ')
+            sssd['services'] = (svc + ', ' + responder).lstrip(', ')
 
     def import_domain(self, name: str, role: BaseRole) -> None:
         """
@@ -247,21 +256,38 @@ class HostSSSD(MultihostUtility):
         :type role: BaseRole
         :raises ValueError: If unsupported provider is given.
         """
-        host = role.host
+        self.import_domains({name: role})
 
-        if not isinstance(host, ProviderHost):
-            raise ValueError(f'Host type {type(host)} can not be imported as domain')
+    def import_domains(self, domains: dict[str, BaseRole]) -> None:
+        """
+        Import multiple SSSD domains from role objects.
 
-        self.config[f'domain/{name}'] = host.client
-        self.config['sssd'].setdefault('domains', '')
+        All domains are imported in one configuration transaction, the
+        ``[sssd]/domains`` option is recomputed only once.
 
-        if not self.config['sssd']['domains']:
-            self.config['sssd']['domains'] = name
-        elif name not in [x.strip() for x in self.config['sssd']['domains'].split(',')]:
-            self.config['sssd']['domains'] += ', ' + name
+        :param domains: Dictionary with domain name as a key and provider role as a value.
+        :type domains: dict[str, BaseRole]
+        :raises ValueError: If unsupported provider is given.
+        """
+        sssd = self.section('sssd')
+        current = [x.strip() for x in sssd.get('domains', '').split(',') if x.strip()]
 
-        if self.default_domain is None:
-            self.default_domain = name
+        for name, role in domains.items():
+            host = role.host
+
+            if not isinstance(host, ProviderHost):
+                raise ValueError(f'Host type {type(host)} can not be imported as domain')
+
+            self.config[f'domain/{name}'] = host.client
+
+            if name not in current:
+                current.append(name)
+
+            if self.default_domain is None:
+                self.default_domain = name
+
+        if current:
+            sssd['domains'] = ', '.join(current)
 
     def config_dumps(self) -> str:
         """
@@ -362,8 +388,11 @@ class HostSSSD(MultihostUtility):
         del self.config[f'domain/{self.default_domain}']
 
     def __get(self, section: str) -> dict[str, str]:
-        self.config.setdefault(section, {})
-        return self.config[section]
+        try:
+            return self.config[section]
+        except KeyError:
+            self.config[section] = {}
+            return self.config[section]
 
     def __set(self, section: str, value: dict[str, str]) -> None:
         self.config[section] = value
@@ -456,15 +485,14 @@ class HostSSSD(MultihostUtility):
         """ Convert configparser to string. """
         with StringIO() as ss:
             cfg.write(ss)
-            ss.seek(0)
-            return ss.read()
+            return ss.getvalue()
 
     def __set_debug_level(self, debug_level: str | None = None) -> configparser:
-        cfg = configparser.ConfigParser()
-        cfg.read_dict(self.config)
-
         if debug_level is None:
-            return self.cfg
+            return self.config
+
+        cfg = configparser.ConfigParser(interpolation=None)
+        cfg.read_dict(self.config)
 
         sections = ['sssd', 'autofs', 'ifp', 'kcm', 'nss', 'pac', 'pam', 'ssh', 'sudo']
         sections += [section for section in cfg.keys() if section.startswith('domain/')]
@@ -87,23 +87,37 @@ class IdEntry(object):
         Secondary groups.
         """
 
-    def memberof(self, groups: int | str | tuple(int, str) | list[int | str | tuple(int, str)]) -> bool:
+        self.__group_ids: frozenset[int] = frozenset(x.id for x in groups if x.id is not None)
+        self.__group_names: frozenset[str] = frozenset(x.name for x in groups if x.name is not None)
+
+    def memberof(self, groups: int | str | tuple(int, str) | list | set) -> bool:
         """
         Check if the user is member of give group(s).
 
         Group specification can be either a single gid or group name. But it can
-        be also a tuple of (gid, name) where both gid and name must match or list
-        of groups where the user must be member of all given groups.
+        be also a tuple of (gid, name) where both gid and name must match or
+        list or set of groups where the user must be member of all given groups.
 
         :param groups: _description_
-        :type groups: int | str | tuple
+        :type groups: int | str | tuple | list | set
         :return: _description_
         :rtype: bool
         """
         if isinstance(groups, (int, str, tuple)):
-            return groups in self.groups
+            groups = [groups]
+
+        return all(self.__is_member(x) for x in groups)
+
+    def __is_member(self, group: int | str | tuple(int, str)) -> bool:
+        # Gids and names are checked against precomputed sets, a (gid, name)
+        # tuple must match a single group so it falls back to a list scan
+        if isinstance(group, int):
+            return group in self.__group_ids
+
+        if isinstance(group, str):
+            return group in self.__group_names
 
-        return all(x in self.groups for x in groups)
+        return group in self.groups
 
     def __str__(self) -> str:
         return f'{{user={str(self.user)},group={str(self.group)},groups={str(self.groups)}}}'